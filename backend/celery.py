@@ -0,0 +1,16 @@
+"""
+Celery config for backend project.
+
+Runs AI enrichment off the request path. Start a worker for the AI queue with:
+    celery -A backend worker -Q ai --concurrency=4
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+app = Celery('backend')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks(related_name='tasks_celery')
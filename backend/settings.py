@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -145,3 +146,12 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+
+# Celery settings (AI enrichment runs on its own queue)
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_TASK_ROUTES = {
+    'tasks.tasks_celery.enrich_task': {'queue': 'ai'},
+    'tasks.tasks_celery.analyze_context_entry': {'queue': 'ai'},
+}
+# Without a broker in development, run enrichment inline
+CELERY_TASK_ALWAYS_EAGER = DEBUG
@@ -0,0 +1,118 @@
+"""
+Response cache for the AI Integration Module
+Avoids paying for an OpenAI round-trip when the same or a near-identical
+input was already answered:
+- Exact matches are looked up by a SHA-256 hash of the prompt in Django's cache
+- Paraphrases are matched by cosine similarity of sentence embeddings
+  (only when AI_SEMANTIC_CACHE is enabled and requirements-semantic.txt is installed)
+"""
+
+import hashlib
+import threading
+import time
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Both come from requirements-semantic.txt
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+
+
+@lru_cache(maxsize=1)
+def _get_embedding_model():
+    """Load the embedding model once per process"""
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+@lru_cache(maxsize=256)
+def _embed(text: str):
+    """Return the normalized embedding of a text"""
+    return _get_embedding_model().encode(text, normalize_embeddings=True)
+
+
+class SemanticCache:
+    """Cache of raw AI responses with an exact-hash fast path and a semantic lookup"""
+
+    def __init__(self, threshold: float = None, ttl: int = None, max_entries: int = 2048):
+        if threshold is None:
+            threshold = getattr(settings, 'AI_SEMANTIC_CACHE_THRESHOLD', 0.92)
+        if ttl is None:
+            ttl = getattr(settings, 'AI_CACHE_TTL', 3600)
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.semantic_enabled = (
+            getattr(settings, 'AI_SEMANTIC_CACHE', False)
+            and np is not None and SentenceTransformer is not None
+        )
+        # (method, scope_hash, embedding, response, expires_at)
+        self._entries: List[Tuple] = []
+        self._lock = threading.Lock()
+
+    def get(self, method: str, prompt: str, text: str, scope: str = '') -> Optional[str]:
+        """
+        Return a cached response for the prompt, or for a semantically similar
+        text answered by the same method with the same scope
+        An empty text restricts the lookup to the exact prompt
+        """
+        response = cache.get(self._key(method, prompt))
+        if response is not None or not self.semantic_enabled or not text:
+            return response
+
+        try:
+            embedding = _embed(text)
+        except Exception as e:
+            print(f"Error computing embedding: {e}")
+            return None
+
+        scope_hash = self._hash(scope)
+        now = time.time()
+        with self._lock:
+            self._entries = [entry for entry in self._entries if entry[4] > now]
+            candidates = [entry for entry in self._entries if entry[0] == method and entry[1] == scope_hash]
+
+        if not candidates:
+            return None
+
+        scores = np.stack([entry[2] for entry in candidates]) @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return candidates[best][3]
+        return None
+
+    def set(self, method: str, prompt: str, text: str, response: str, scope: str = '') -> None:
+        """Store a response under its exact prompt hash and its text embedding"""
+        cache.set(self._key(method, prompt), response, self.ttl)
+        if not self.semantic_enabled or not text:
+            return
+
+        try:
+            embedding = _embed(text)
+        except Exception as e:
+            print(f"Error computing embedding: {e}")
+            return
+
+        with self._lock:
+            self._entries.append((method, self._hash(scope), embedding, response, time.time() + self.ttl))
+            if len(self._entries) > self.max_entries:
+                del self._entries[:len(self._entries) - self.max_entries]
+
+    def _key(self, method: str, prompt: str) -> str:
+        """Cache key for the exact-match lookup"""
+        return f"ai_response:{method}:{self._hash(prompt)}"
+
+    @staticmethod
+    def _hash(value: str) -> str:
+        return hashlib.sha256(value.encode('utf-8')).hexdigest()
@@ -8,13 +8,132 @@ Handles AI-powered task management features including:
 - Task enhancement
 """
 
+import asyncio
+import functools
 import json
 import re
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
 from django.utils import timezone
+from .ai_cache import SemanticCache
+from .rate_limit import TokenBucket
+
+try:
+    # orjson (de)serializes several times faster than the stdlib; its JSONDecodeError
+    # subclasses json.JSONDecodeError so existing handlers keep working
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+    
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+_WORD_RE = re.compile(r'[a-z]{4,}')
+_CODE_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```\s*$', re.DOTALL)
+_TOKEN_RE = re.compile(r'\w+')
+_STOPWORDS = frozenset({'this', 'that', 'with', 'from', 'they', 'have', 'will', 'been', 'were'})
+_URGENCY = frozenset({'urgent', 'asap', 'immediately', 'deadline', 'due', 'important', 'critical', 'emergency'})
+
+# Fallback categories in order of precedence: (category, tags, title keywords)
+_CATEGORY_RULES = (
+    ('Work', ('work', 'professional'), ('work', 'job', 'office', 'meeting', 'project')),
+    ('Home', ('home', 'household'), ('home', 'house', 'clean', 'cook', 'garden')),
+    ('Health', ('health', 'wellness'), ('health', 'exercise', 'gym', 'doctor', 'medical')),
+    ('Learning', ('learning', 'education'), ('learn', 'study', 'course', 'book', 'read')),
+)
+_DEFAULT_CATEGORY = ('Personal', ('personal', 'general'))
+
+
+def _build_category_automaton():
+    """Compile all category keywords into one Aho-Corasick automaton"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, (category, tags, keywords) in enumerate(_CATEGORY_RULES):
+        for keyword in keywords:
+            # Keep the highest-precedence category for a keyword listed twice
+            if keyword not in automaton:
+                automaton.add_word(keyword, (rank, category, tags))
+    automaton.make_automaton()
+    return automaton
+
+
+_CATEGORY_AUTOMATON = _build_category_automaton()
+
+
+# The title-keyed fallback heuristics are pure functions of short inputs, so
+# identical titles (very common: "Standup", "Review PR") are served from memory.
+# Results are immutable; the AITaskManager wrappers hand out mutable copies.
+
+@functools.lru_cache(maxsize=2048)
+def _fallback_priority_calculation_impl(title: str, description: str) -> float:
+    """Fallback priority calculation"""
+    words = set(_TOKEN_RE.findall(f"{title} {description}".lower()))
+    
+    urgency_count = len(words & _URGENCY)
+    if urgency_count >= 2:
+        return 0.9
+    elif urgency_count == 1:
+        return 0.7
+    else:
+        return 0.5
+
+
+@functools.lru_cache(maxsize=2048)
+def _fallback_categorization_impl(title: str) -> Tuple[str, Tuple[str, ...]]:
+    """Fallback categorization"""
+    title_lower = title.lower()
+    
+    if _CATEGORY_AUTOMATON is not None:
+        # One pass over the title finds every keyword; the best-ranked match wins
+        match = min((value for _, value in _CATEGORY_AUTOMATON.iter(title_lower)), default=None)
+        if match:
+            return match[1], match[2]
+        return _DEFAULT_CATEGORY
+    
+    for category, tags, keywords in _CATEGORY_RULES:
+        if any(word in title_lower for word in keywords):
+            return category, tags
+    return _DEFAULT_CATEGORY
+
+
+def _load_json(answer: str):
+    """Decode a JSON answer, unwrapping the Markdown code fence models sometimes add"""
+    match = _CODE_FENCE_RE.match(answer)
+    return json_loads(match.group(1) if match else answer)
+
+
+def _is_json_object(answer: str) -> bool:
+    """Whether the answer decodes to a JSON object"""
+    try:
+        return isinstance(_load_json(answer), dict)
+    except ValueError:
+        return False
+
+
+@dataclass
+class TaskAnalysis:
+    """Combined AI suggestions for a new task"""
+    priority_score: float
+    suggested_deadline: Optional[datetime] = None
+    category: str = 'General'
+    tags: List[str] = field(default_factory=list)
+    enhanced_description: str = ''
+    from_ai: bool = False  # False when any part came from the local fallbacks
+
 
 class AITaskManager:
     """AI-powered task management system"""
@@ -24,6 +143,37 @@ class AITaskManager:
         self.base_url = "https://api.openai.com/v1/chat/completions"
         self.model = "gpt-3.5-turbo"
         
+        # Reuse one keep-alive connection pool for every API call so only the
+        # first request made by a worker pays for the TCP + TLS handshake
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            # 429 is not retried: a rate-limited call should go straight to the
+            # fallbacks rather than wait out Retry-After
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504],
+                allowed_methods=frozenset(['POST']),
+                respect_retry_after_header=False,
+                raise_on_status=False
+            )
+        ))
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+        self.cache = SemanticCache()
+        # Long-lived async clients, one per event loop
+        self._loop_clients = weakref.WeakKeyDictionary()
+        # Skip to the fallbacks when we'd only be rate-limited by the API
+        self._bucket = TokenBucket(
+            rate=getattr(settings, 'AI_RATE_LIMIT', 3),
+            capacity=getattr(settings, 'AI_RATE_LIMIT_BURST', 10),
+            shared=getattr(settings, 'AI_RATE_LIMIT_SHARED', False)
+        )
+        
     def analyze_context(self, context_text: str, source_type: str = 'notes') -> Dict:
         """
         Analyze daily context to extract insights, keywords, and sentiment
@@ -43,9 +193,11 @@ class AITaskManager:
             Return as JSON with keys: topics, deadlines, priorities, sentiment, action_items, keywords
             """
             
-            response = self._call_ai_api(prompt)
+            response = self._call_ai_api(prompt, method='analyze_context', json_mode=True,
+                                         text=context_text, scope=source_type,
+                                         validate=_is_json_object)
             if response:
-                return json.loads(response)
+                return _load_json(response)
             else:
                 # Fallback analysis without AI
                 return self._fallback_context_analysis(context_text)
@@ -60,15 +212,93 @@ class AITaskManager:
         Calculate AI-based priority score for a task
         """
         try:
-            context_summary = ""
-            if context_entries:
-                context_summary = " ".join([entry.get('content', '') for entry in context_entries])
-            
-            prompt = f"""
+            prompt, options = self._priority_request(task_title, task_description, context_entries)
+            response = self._call_ai_api(prompt, **options)
+            return self._parse_priority(response, task_title, task_description)[0]
+                
+        except Exception as e:
+            print(f"Error in task prioritization: {e}")
+            return self._fallback_priority_calculation(task_title, task_description)
+    
+    def suggest_deadline(self, task_title: str, task_description: str, 
+                        current_workload: int = 0) -> Optional[datetime]:
+        """
+        Suggest realistic deadline based on task complexity and workload
+        """
+        try:
+            prompt, options = self._deadline_request(task_title, task_description, current_workload)
+            response = self._call_ai_api(prompt, **options)
+            return self._parse_deadline(response, task_title, current_workload)[0]
+                
+        except Exception as e:
+            print(f"Error in deadline suggestion: {e}")
+            return self._fallback_deadline_suggestion(task_title, current_workload)
+    
+    def suggest_categories_and_tags(self, task_title: str, task_description: str) -> Tuple[str, List[str]]:
+        """
+        Suggest category and tags for a task
+        """
+        try:
+            prompt, options = self._categorization_request(task_title, task_description)
+            response = self._call_ai_api(prompt, **options)
+            return self._parse_categorization(response, task_title)[0]
+                
+        except Exception as e:
+            print(f"Error in categorization: {e}")
+            return self._fallback_categorization(task_title)
+    
+    def enhance_task_description(self, task_title: str, task_description: str, 
+                                context_entries: List[Dict] = None) -> str:
+        """
+        Enhance task description with context-aware details
+        """
+        try:
+            prompt, options = self._enhancement_request(task_title, task_description, context_entries)
+            response = self._call_ai_api(prompt, **options)
+            return self._parse_enhancement(response, task_title, task_description)[0]
+                
+        except Exception as e:
+            print(f"Error in description enhancement: {e}")
+            return self._fallback_description_enhancement(task_title, task_description)
+    
+    def _summarize_context(self, context_entries: List[Dict] = None, max_chars: int = 1500) -> str:
+        """
+        Join recent context entries, most recent first, into a string of at
+        most max_chars so prompt size doesn't grow with the amount of context
+        """
+        if not context_entries:
+            return ""
+        
+        parts = []
+        remaining = max_chars
+        for entry in context_entries:
+            content = entry.get('content', '')[:remaining]
+            parts.append(content)
+            remaining -= len(content) + 1
+            if remaining <= 0:
+                break
+        return " ".join(parts)
+    
+    def _context_keywords(self, context_entries: List[Dict] = None) -> str:
+        """Extract the main context keywords locally, for prompts that don't need the full text"""
+        if not context_entries:
+            return ""
+        return ", ".join(self._fallback_context_analysis(self._summarize_context(context_entries))['keywords'])
+    
+    # Each *_request helper returns the prompt and the _call_ai_api options for
+    # one field; each _parse_* helper returns (value, from_ai), where from_ai is
+    # False when the local fallback had to be used.
+    
+    def _priority_request(self, task_title: str, task_description: str,
+                          context_entries: List[Dict] = None) -> Tuple[str, Dict]:
+        """Build the request for task prioritization"""
+        context_keywords = self._context_keywords(context_entries)
+        
+        prompt = f"""
             Calculate a priority score (0.0 to 1.0) for this task based on:
             - Task title: {task_title}
             - Task description: {task_description}
-            - Recent context: {context_summary}
+            - Recent context keywords: {context_keywords}
             
             Consider factors like:
             - Urgency indicators (deadline, urgent, ASAP, etc.)
@@ -78,27 +308,28 @@ class AITaskManager:
             
             Return only the numeric score (0.0 to 1.0).
             """
-            
-            response = self._call_ai_api(prompt)
-            if response:
-                try:
-                    return float(response.strip())
-                except ValueError:
-                    return self._fallback_priority_calculation(task_title, task_description)
-            else:
-                return self._fallback_priority_calculation(task_title, task_description)
-                
-        except Exception as e:
-            print(f"Error in task prioritization: {e}")
-            return self._fallback_priority_calculation(task_title, task_description)
+        return prompt, {
+            'max_tokens': 6,
+            'method': 'prioritize_task',
+            'text': f"{task_title}\n{task_description}",
+            'scope': context_keywords,
+            'validate': lambda answer: self._parse_priority(answer, task_title, task_description)[1]
+        }
     
-    def suggest_deadline(self, task_title: str, task_description: str, 
-                        current_workload: int = 0) -> Optional[datetime]:
-        """
-        Suggest realistic deadline based on task complexity and workload
-        """
+    def _parse_priority(self, value, task_title: str, task_description: str) -> Tuple[float, bool]:
+        """Parse the priority score returned by the AI"""
         try:
-            prompt = f"""
+            score = float(str(value).strip())
+        except (TypeError, ValueError):
+            score = None
+        if value is not None and score is not None and 0.0 <= score <= 1.0:
+            return score, True
+        return self._fallback_priority_calculation(task_title, task_description), False
+    
+    def _deadline_request(self, task_title: str, task_description: str,
+                          current_workload: int = 0) -> Tuple[str, Dict]:
+        """Build the request for deadline suggestion"""
+        prompt = f"""
             Suggest a realistic deadline for this task:
             - Task: {task_title}
             - Description: {task_description}
@@ -113,26 +344,25 @@ class AITaskManager:
             Return the suggested deadline in format: YYYY-MM-DD HH:MM
             If no specific deadline needed, return "None"
             """
-            
-            response = self._call_ai_api(prompt)
-            if response and response.strip().lower() != "none":
-                try:
-                    return datetime.strptime(response.strip(), "%Y-%m-%d %H:%M")
-                except ValueError:
-                    return self._fallback_deadline_suggestion(task_title, current_workload)
-            else:
-                return None
-                
-        except Exception as e:
-            print(f"Error in deadline suggestion: {e}")
-            return self._fallback_deadline_suggestion(task_title, current_workload)
+        return prompt, {'max_tokens': 20}
     
-    def suggest_categories_and_tags(self, task_title: str, task_description: str) -> Tuple[str, List[str]]:
-        """
-        Suggest category and tags for a task
-        """
+    def _parse_deadline(self, value, task_title: str,
+                        current_workload: int = 0) -> Tuple[Optional[datetime], bool]:
+        """Parse the deadline returned by the AI; None means no answer"""
+        if value is None:
+            return None, False
+        
+        value = str(value).strip()
+        if value.lower() in ("none", "null", ""):
+            return None, True
         try:
-            prompt = f"""
+            return datetime.strptime(value, "%Y-%m-%d %H:%M"), True
+        except ValueError:
+            return self._fallback_deadline_suggestion(task_title, current_workload), False
+    
+    def _categorization_request(self, task_title: str, task_description: str) -> Tuple[str, Dict]:
+        """Build the request for categorization"""
+        prompt = f"""
             Suggest a category and tags for this task:
             - Task: {task_title}
             - Description: {task_description}
@@ -141,32 +371,45 @@ class AITaskManager:
             
             Common categories: Work, Personal, Health, Finance, Learning, Home, Social
             """
-            
-            response = self._call_ai_api(prompt)
-            if response:
-                try:
-                    result = json.loads(response)
-                    return result.get('category', 'General'), result.get('tags', [])
-                except json.JSONDecodeError:
-                    return self._fallback_categorization(task_title)
-            else:
-                return self._fallback_categorization(task_title)
-                
-        except Exception as e:
-            print(f"Error in categorization: {e}")
-            return self._fallback_categorization(task_title)
+        return prompt, {
+            'max_tokens': 120,
+            'method': 'suggest_categories_and_tags',
+            'json_mode': True,
+            'text': f"{task_title}\n{task_description}",
+            'validate': lambda answer: self._parse_categorization(answer, task_title)[1]
+        }
     
-    def enhance_task_description(self, task_title: str, task_description: str, 
-                                context_entries: List[Dict] = None) -> str:
-        """
-        Enhance task description with context-aware details
-        """
+    def _parse_categorization(self, response: Optional[str],
+                              task_title: str) -> Tuple[Tuple[str, List[str]], bool]:
+        """Parse the category and tags JSON returned by the AI"""
         try:
-            context_summary = ""
-            if context_entries:
-                context_summary = " ".join([entry.get('content', '') for entry in context_entries])
-            
-            prompt = f"""
+            result = _load_json(response) if response else None
+        except json.JSONDecodeError:
+            result = None
+        if not isinstance(result, dict):
+            return self._fallback_categorization(task_title), False
+        return self._validate_categorization(result.get('category'), result.get('tags'), task_title)
+    
+    def _validate_categorization(self, category, tags,
+                                 task_title: str) -> Tuple[Tuple[str, List[str]], bool]:
+        """Check the category is a name and tags a list of strings, falling back otherwise"""
+        category_ok = isinstance(category, str) and bool(category.strip())
+        tags_ok = isinstance(tags, list) and all(isinstance(tag, str) for tag in tags)
+        if category_ok and tags_ok:
+            return (category.strip(), tags), True
+        
+        fallback_category, fallback_tags = self._fallback_categorization(task_title)
+        return (
+            category.strip() if category_ok else fallback_category,
+            tags if tags_ok else fallback_tags
+        ), False
+    
+    def _enhancement_request(self, task_title: str, task_description: str,
+                             context_entries: List[Dict] = None) -> Tuple[str, Dict]:
+        """Build the request for description enhancement"""
+        context_summary = self._summarize_context(context_entries)
+        
+        prompt = f"""
             Enhance this task description with relevant context and details:
             - Original title: {task_title}
             - Original description: {task_description}
@@ -180,56 +423,341 @@ class AITaskManager:
             
             Return only the enhanced description.
             """
+        return prompt, {
+            'method': 'enhance_task_description',
+            'text': f"{task_title}\n{task_description}",
+            'scope': context_summary,
+            'validate': lambda answer: self._parse_enhancement(answer, task_title, task_description)[1]
+        }
+    
+    def _parse_enhancement(self, value, task_title: str, task_description: str) -> Tuple[str, bool]:
+        """Parse the enhanced description returned by the AI"""
+        if isinstance(value, str) and value.strip():
+            return value.strip(), True
+        return self._fallback_description_enhancement(task_title, task_description), False
+    
+    def analyze_new_task(self, task_title: str, task_description: str,
+                         context_entries: List[Dict] = None,
+                         current_workload: int = 0) -> TaskAnalysis:
+        """
+        Get priority, deadline, category, tags and enhanced description
+        for a new task in a single AI call
+        """
+        try:
+            prompt, options = self._task_analysis_request(
+                task_title, task_description, context_entries, current_workload
+            )
+            response = self._call_ai_api(prompt, **options)
             
-            response = self._call_ai_api(prompt)
-            if response:
-                return response.strip()
-            else:
-                return self._fallback_description_enhancement(task_title, task_description)
+            analysis = self._task_analysis_from_response(response, task_title, task_description, current_workload)
+            if analysis is None:
+                # Fall back to one request per field
+                return self._analyze_new_task_per_field(
+                    task_title, task_description, context_entries, current_workload
+                )
+            return analysis
                 
         except Exception as e:
-            print(f"Error in description enhancement: {e}")
-            return self._fallback_description_enhancement(task_title, task_description)
+            print(f"Error in task analysis: {e}")
+            return self._fallback_task_analysis(task_title, task_description)
+    
+    async def a_analyze_new_task(self, task_title: str, task_description: str,
+                                 context_entries: List[Dict] = None,
+                                 current_workload: int = 0) -> TaskAnalysis:
+        """Async variant of analyze_new_task over the event loop's long-lived client"""
+        try:
+            client = self._shared_async_client()
+            prompt, options = self._task_analysis_request(
+                task_title, task_description, context_entries, current_workload
+            )
+            response = await self.a_call_ai_api(prompt, client, **options)
+            
+            analysis = self._task_analysis_from_response(response, task_title, task_description, current_workload)
+            if analysis is None:
+                # Fall back to one request per field
+                return await self.a_analyze_new_task_per_field(
+                    task_title, task_description, context_entries, current_workload, client
+                )
+            return analysis
+                
+        except Exception as e:
+            print(f"Error in task analysis: {e}")
+            return self._fallback_task_analysis(task_title, task_description)
+    
+    def _task_analysis_from_response(self, response: Optional[str], task_title: str,
+                                     task_description: str, current_workload: int = 0) -> Optional[TaskAnalysis]:
+        """Convert the combined AI answer, or return None when it isn't JSON"""
+        if not response:
+            return self._fallback_task_analysis(task_title, task_description)
+        
+        try:
+            result = _load_json(response)
+        except json.JSONDecodeError:
+            return None
+        
+        return self._parse_task_analysis(result, task_title, task_description, current_workload)
+    
+    def _task_analysis_request(self, task_title: str, task_description: str,
+                               context_entries: List[Dict] = None,
+                               current_workload: int = 0) -> Tuple[str, Dict]:
+        """Build the combined request for new task analysis"""
+        context_summary = self._summarize_context(context_entries)
+        
+        prompt = f"""
+            Analyze this task:
+            - Task title: {task_title}
+            - Task description: {task_description}
+            - Recent context: {context_summary}
+            - Current workload: {current_workload} tasks
+            
+            Provide:
+            1. priority_score: a number from 0.0 to 1.0 based on urgency indicators,
+               importance keywords, context relevance and time sensitivity
+            2. suggested_deadline: a realistic deadline in format YYYY-MM-DD HH:MM
+               considering complexity and workload, or null if none is needed
+            3. category: one of Work, Personal, Health, Finance, Learning, Home, Social
+            4. tags: a list of up to three short tags
+            5. enhanced_description: the description enhanced with relevant context,
+               specific details, related deadlines or dependencies and suggested steps
+            
+            Return as JSON with keys: priority_score, suggested_deadline, category, tags, enhanced_description
+            """
+        
+        # Exact-prompt cache only: the answer carries a suggested deadline for
+        # this exact task, which a paraphrased task should not inherit
+        return prompt, {
+            'max_tokens': 650,
+            'method': 'analyze_new_task',
+            'json_mode': True,
+            # Only cache answers that need no fallback, so incomplete ones are retried
+            'validate': lambda answer: _is_json_object(answer) and self._parse_task_analysis(
+                _load_json(answer), task_title, task_description, current_workload
+            ).from_ai
+        }
     
-    def _call_ai_api(self, prompt: str) -> Optional[str]:
+    def quick_task_analysis(self, task_title: str, task_description: str) -> TaskAnalysis:
+        """
+        Cheap local task analysis used until AI enrichment completes
+        """
+        return self._fallback_task_analysis(task_title, task_description)
+    
+    def _analyze_new_task_per_field(self, task_title: str, task_description: str,
+                                    context_entries: List[Dict] = None,
+                                    current_workload: int = 0) -> TaskAnalysis:
+        """Build the task analysis from the individual AI calls, run concurrently"""
+        return asyncio.run(self.a_analyze_new_task_per_field(
+            task_title, task_description, context_entries, current_workload
+        ))
+    
+    async def a_analyze_new_task_per_field(self, task_title: str, task_description: str,
+                                           context_entries: List[Dict] = None,
+                                           current_workload: int = 0,
+                                           client: Optional[httpx.AsyncClient] = None) -> TaskAnalysis:
+        """Run the four independent AI calls concurrently over one connection pool"""
+        if client is None:
+            async with self._async_client() as client:
+                return await self.a_analyze_new_task_per_field(
+                    task_title, task_description, context_entries, current_workload, client
+                )
+        
+        responses = await asyncio.gather(*[
+            self.a_call_ai_api(prompt, client, **options)
+            for prompt, options in self._field_requests(
+                task_title, task_description, context_entries, current_workload
+            )
+        ])
+        return self._parse_field_responses(responses, task_title, task_description, current_workload)
+    
+    def _field_requests(self, task_title: str, task_description: str,
+                        context_entries: List[Dict] = None,
+                        current_workload: int = 0) -> List[Tuple[str, Dict]]:
+        """Requests for priority, deadline, categorization and enhancement, in that order"""
+        return [
+            self._priority_request(task_title, task_description, context_entries),
+            self._deadline_request(task_title, task_description, current_workload),
+            self._categorization_request(task_title, task_description),
+            self._enhancement_request(task_title, task_description, context_entries),
+        ]
+    
+    def _parse_field_responses(self, responses: List[Optional[str]], task_title: str,
+                               task_description: str, current_workload: int = 0) -> TaskAnalysis:
+        """Combine the per-field AI responses into a task analysis"""
+        priority_response, deadline_response, categorization_response, enhancement_response = responses
+        priority_score, priority_ok = self._parse_priority(priority_response, task_title, task_description)
+        suggested_deadline, deadline_ok = self._parse_deadline(deadline_response, task_title, current_workload)
+        (category, tags), category_ok = self._parse_categorization(categorization_response, task_title)
+        enhanced_description, enhancement_ok = self._parse_enhancement(
+            enhancement_response, task_title, task_description
+        )
+        
+        return TaskAnalysis(
+            priority_score=priority_score,
+            suggested_deadline=suggested_deadline,
+            category=category,
+            tags=tags,
+            enhanced_description=enhanced_description,
+            from_ai=all((priority_ok, deadline_ok, category_ok, enhancement_ok))
+        )
+    
+    def _parse_task_analysis(self, result: Dict, task_title: str, task_description: str,
+                             current_workload: int = 0) -> TaskAnalysis:
+        """Convert the combined AI response, falling back per invalid field"""
+        if not isinstance(result, dict):
+            return self._fallback_task_analysis(task_title, task_description)
+        
+        priority_score, priority_ok = self._parse_priority(
+            result.get('priority_score'), task_title, task_description
+        )
+        
+        if 'suggested_deadline' in result and result['suggested_deadline'] is None:
+            # An explicit null means no deadline is needed
+            suggested_deadline, deadline_ok = None, True
+        else:
+            suggested_deadline, deadline_ok = self._parse_deadline(
+                result.get('suggested_deadline'), task_title, current_workload
+            )
+        
+        (category, tags), category_ok = self._validate_categorization(
+            result.get('category'), result.get('tags'), task_title
+        )
+        
+        enhanced_description, enhancement_ok = self._parse_enhancement(
+            result.get('enhanced_description'), task_title, task_description
+        )
+        
+        return TaskAnalysis(
+            priority_score=priority_score,
+            suggested_deadline=suggested_deadline,
+            category=category,
+            tags=tags,
+            enhanced_description=enhanced_description,
+            from_ai=all((priority_ok, deadline_ok, category_ok, enhancement_ok))
+        )
+    
+    def _call_ai_api(self, prompt: str, max_tokens: int = 500, method: str = None,
+                     text: str = '', scope: str = '', json_mode: bool = False,
+                     validate: Callable[[str], bool] = None) -> Optional[str]:
         """
         Call OpenAI API for AI processing
+        
+        max_tokens caps the length of the answer and should be small for short answers.
+        json_mode makes the API return a bare JSON object for prompts that ask for JSON.
+        When method is given, responses are cached per method and looked up by
+        the exact prompt or by the semantic similarity of text within scope.
+        Only answers accepted by validate are cached, so a malformed answer is
+        asked again next time instead of being served for the cache TTL
         """
-        if not self.api_key:
-            return None
+        answer, body = self._before_call(prompt, max_tokens, method, text, scope, json_mode)
+        if body is None:
+            return answer
             
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": 500,
-                "temperature": 0.3
-            }
+            # Send pre-encoded bytes; the session already sets the JSON content type
+            response = self.session.post(self.base_url, data=body, timeout=10)
+            return self._after_call(response.status_code, response.content, prompt,
+                                    method, text, scope, validate)
+                
+        except Exception as e:
+            print(f"Error calling AI API: {e}")
+            return None
+    
+    async def a_call_ai_api(self, prompt: str, client: httpx.AsyncClient,
+                            max_tokens: int = 500, method: str = None, text: str = '',
+                            scope: str = '', json_mode: bool = False,
+                            validate: Callable[[str], bool] = None) -> Optional[str]:
+        """
+        Call OpenAI API for AI processing without blocking the event loop
+        """
+        answer, body = self._before_call(prompt, max_tokens, method, text, scope, json_mode)
+        if body is None:
+            return answer
             
-            response = requests.post(self.base_url, headers=headers, json=data, timeout=10)
-            if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content']
-            else:
-                print(f"API call failed: {response.status_code}")
-                return None
+        try:
+            response = await client.post(self.base_url, content=body)
+            return self._after_call(response.status_code, response.content, prompt,
+                                    method, text, scope, validate)
                 
         except Exception as e:
             print(f"Error calling AI API: {e}")
             return None
     
+    def _before_call(self, prompt: str, max_tokens: int, method: Optional[str],
+                     text: str, scope: str, json_mode: bool = False) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Steps shared by the sync and async clients before a request
+        
+        Returns (answer, None) when no request should be made: the cached answer,
+        or None without an API key or once the rate limit is reached.
+        Otherwise returns (None, body) with the encoded request body
+        """
+        if not self.api_key:
+            return None, None
+        
+        if method:
+            cached = self.cache.get(method, prompt, text, scope)
+            if cached is not None:
+                return cached, None
+        
+        if not self._bucket.try_consume():
+            print("AI rate limit reached, using fallback")
+            return None, None
+        
+        data = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": 0.3
+        }
+        if json_mode:
+            data["response_format"] = {"type": "json_object"}
+        return None, json_dumps(data)
+    
+    def _after_call(self, status_code: int, content: bytes, prompt: str, method: Optional[str],
+                    text: str, scope: str, validate: Callable[[str], bool] = None) -> Optional[str]:
+        """Steps shared by the sync and async clients after a request"""
+        if status_code != 200:
+            print(f"API call failed: {status_code}")
+            return None
+        
+        answer = json_loads(content)['choices'][0]['message']['content']
+        if method and (validate is None or validate(answer)):
+            self.cache.set(method, prompt, text, answer, scope)
+        return answer
+    
+    def _async_client(self) -> httpx.AsyncClient:
+        """
+        Create a pooled async HTTP client for concurrent API calls
+        """
+        return httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=10
+        )
+    
+    def _shared_async_client(self) -> httpx.AsyncClient:
+        """
+        Return the long-lived async client of the running event loop
+        
+        httpx connections belong to the loop that opened them, so each loop
+        gets its own client; under ASGI that is one pool for the whole process
+        """
+        loop = asyncio.get_running_loop()
+        client = self._loop_clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._loop_clients[loop] = self._async_client()
+        return client
+    
     def _fallback_context_analysis(self, context_text: str) -> Dict:
         """Fallback context analysis without AI"""
-        keywords = re.findall(r'\b\w{4,}\b', context_text.lower())
-        keywords = [k for k in keywords if k not in ['this', 'that', 'with', 'from', 'they', 'have', 'will', 'been', 'were']]
+        # Not cached: context bodies are large and rarely repeat exactly
+        text = context_text.lower()
+        counts = Counter(word for word in _WORD_RE.findall(text) if word not in _STOPWORDS)
+        keywords = [word for word, _ in counts.most_common(10)]
         
-        urgency_words = ['urgent', 'asap', 'immediately', 'deadline', 'due', 'important', 'critical']
-        urgency_score = sum(1 for word in urgency_words if word in context_text.lower())
+        urgency_score = len(set(_TOKEN_RE.findall(text)) & _URGENCY)
         
         return {
             'topics': keywords[:5],
@@ -242,16 +770,7 @@ class AITaskManager:
     
     def _fallback_priority_calculation(self, title: str, description: str) -> float:
         """Fallback priority calculation"""
-        urgency_words = ['urgent', 'asap', 'immediately', 'deadline', 'due', 'important', 'critical', 'emergency']
-        text = f"{title} {description}".lower()
-        
-        urgency_count = sum(1 for word in urgency_words if word in text)
-        if urgency_count >= 2:
-            return 0.9
-        elif urgency_count == 1:
-            return 0.7
-        else:
-            return 0.5
+        return _fallback_priority_calculation_impl(title, description)
     
     def _fallback_deadline_suggestion(self, title: str, workload: int) -> Optional[datetime]:
         """Fallback deadline suggestion"""
@@ -261,18 +780,18 @@ class AITaskManager:
     
     def _fallback_categorization(self, title: str) -> Tuple[str, List[str]]:
         """Fallback categorization"""
-        title_lower = title.lower()
-        
-        if any(word in title_lower for word in ['work', 'job', 'office', 'meeting', 'project']):
-            return 'Work', ['work', 'professional']
-        elif any(word in title_lower for word in ['home', 'house', 'clean', 'cook', 'garden']):
-            return 'Home', ['home', 'household']
-        elif any(word in title_lower for word in ['health', 'exercise', 'gym', 'doctor', 'medical']):
-            return 'Health', ['health', 'wellness']
-        elif any(word in title_lower for word in ['learn', 'study', 'course', 'book', 'read']):
-            return 'Learning', ['learning', 'education']
-        else:
-            return 'Personal', ['personal', 'general']
+        category, tags = _fallback_categorization_impl(title)
+        return category, list(tags)
+    
+    def _fallback_task_analysis(self, title: str, description: str) -> TaskAnalysis:
+        """Fallback task analysis"""
+        category, tags = self._fallback_categorization(title)
+        return TaskAnalysis(
+            priority_score=self._fallback_priority_calculation(title, description),
+            category=category,
+            tags=tags,
+            enhanced_description=self._fallback_description_enhancement(title, description)
+        )
     
     def _fallback_description_enhancement(self, title: str, description: str) -> str:
         """Fallback description enhancement"""
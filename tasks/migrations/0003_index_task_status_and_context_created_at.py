@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-15 21:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_category_alter_task_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contextentry',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], db_index=True, default='pending', max_length=20),
+        ),
+    ]
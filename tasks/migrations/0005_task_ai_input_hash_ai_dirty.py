@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-15 21:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_user_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='ai_dirty',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='ai_input_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
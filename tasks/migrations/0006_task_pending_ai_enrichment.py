@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-15 21:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_ai_input_hash_ai_dirty'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='pending_ai_enrichment',
+            field=models.BooleanField(default=False),
+        ),
+    ]
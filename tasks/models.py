@@ -1,3 +1,4 @@
+import hashlib
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -34,7 +35,7 @@ class ContextEntry(models.Model):
     priority_score = models.FloatField(default=0.0)  # AI-calculated priority
     keywords = models.JSONField(default=list, blank=True)  # Extracted keywords
     sentiment_score = models.FloatField(default=0.0)  # Sentiment analysis
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -69,6 +70,9 @@ class Task(models.Model):
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
     tags = models.JSONField(default=list, blank=True)  # AI-suggested tags
     ai_enhanced_description = models.TextField(blank=True, null=True)  # AI-enhanced description
+    ai_input_hash = models.CharField(max_length=64, db_index=True, blank=True)  # Hash of title/description the AI saw
+    ai_dirty = models.BooleanField(default=True)  # AI fields need recomputing
+    pending_ai_enrichment = models.BooleanField(default=False)  # AI enrichment queued in the background
     context_references = models.ManyToManyField(ContextEntry, blank=True)  # Related context entries
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -77,6 +81,16 @@ class Task(models.Model):
     
     class Meta:
         ordering = ['-priority_score', '-created_at']
+        indexes = [
+            models.Index(fields=['user', 'status']),
+            models.Index(fields=['user', 'priority_score']),
+            models.Index(fields=['user', 'due_date', 'status']),
+        ]
     
     def __str__(self):
         return self.title
+    
+    @staticmethod
+    def compute_ai_input_hash(title: str, description: str) -> str:
+        """Hash of the inputs used for AI enrichment"""
+        return hashlib.sha256(f"{title or ''}\x00{description or ''}".encode('utf-8')).hexdigest()
@@ -0,0 +1,54 @@
+"""
+Client-side rate limiting for the AI Integration Module
+Lets callers skip straight to the local fallbacks instead of waiting on
+requests that the OpenAI API would reject with 429
+"""
+
+import threading
+import time
+
+from django.core.cache import cache
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` calls per second with bursts up to `capacity`
+
+    With shared=True the limit is enforced across processes through Django's
+    cache (INCR + EXPIRE on Redis) as a fixed window of `capacity` calls per
+    capacity / rate seconds.
+    """
+
+    def __init__(self, rate: float, capacity: int, shared: bool = False, key: str = 'ai_rate_limit'):
+        self.rate = rate
+        self.capacity = capacity
+        self.shared = shared
+        self.key = key
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_consume(self) -> bool:
+        """Take one token if available, without blocking"""
+        if self.shared:
+            return self._try_consume_shared()
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def _try_consume_shared(self) -> bool:
+        window = self.capacity / self.rate
+        key = f"{self.key}:{int(time.time() // window)}"
+        try:
+            cache.add(key, 0, timeout=int(window) + 1)
+            return cache.incr(key) <= self.capacity
+        except Exception as e:
+            # Never block AI calls because the cache is unavailable
+            print(f"Error checking rate limit: {e}")
+            return True
@@ -1,9 +1,35 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from django.utils import timezone
-from datetime import timedelta
+from django.db import transaction
 from .models import Task, Category, ContextEntry
 from .ai_module import ai_manager
+from .tasks_celery import enrich_task
+from .utils import task_analysis_fields
+
+
+STATUS_DISPLAY = dict(Task.STATUS_CHOICES)
+PRIORITY_DISPLAY = dict(Task.PRIORITY_CHOICES)
+
+
+def apply_quick_analysis(validated_data, title, description):
+    """
+    Fill validated_data with cheap local suggestions and mark the task for
+    AI enrichment, which runs in the background once the task is saved
+    """
+    analysis = ai_manager.quick_task_analysis(title, description)
+    validated_data.update(task_analysis_fields(analysis, title, description))
+    validated_data['pending_ai_enrichment'] = True
+
+
+def schedule_ai_enrichment(task):
+    """Queue AI enrichment for the task after the current transaction commits"""
+    def enqueue():
+        enrich_task.delay(task.id)
+        # An eager job has already saved its results, so don't respond with stale ones
+        if enrich_task.app.conf.task_always_eager:
+            task.refresh_from_db()
+    
+    transaction.on_commit(enqueue)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -14,21 +40,33 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskDisplayMixin(serializers.Serializer):
+    """Adds the status and priority labels to Task serializers"""
+    status_display = serializers.SerializerMethodField()
+    priority_display = serializers.SerializerMethodField()
+    
+    def get_status_display(self, obj):
+        """Return the status label from the prebuilt choices dict"""
+        return STATUS_DISPLAY.get(obj.status, obj.status)
+    
+    def get_priority_display(self, obj):
+        """Return the priority label from the prebuilt choices dict"""
+        return PRIORITY_DISPLAY.get(obj.priority, obj.priority)
+
+
+class TaskSerializer(TaskDisplayMixin, serializers.ModelSerializer):
     """Main serializer for Task model"""
     user = UserSerializer(read_only=True)
     user_id = serializers.IntegerField(write_only=True, required=False)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
-    priority_display = serializers.CharField(source='get_priority_display', read_only=True)
     
     class Meta:
         model = Task
         fields = [
             'id', 'title', 'description', 'status', 'status_display',
             'priority', 'priority_display', 'due_date', 'created_at',
-            'updated_at', 'completed_at', 'user', 'user_id'
+            'updated_at', 'completed_at', 'user', 'user_id', 'pending_ai_enrichment'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'completed_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'completed_at', 'pending_ai_enrichment']
     
     def validate_title(self, value):
         """Validate that title is not empty"""
@@ -72,13 +110,23 @@ class TaskSerializer(serializers.ModelSerializer):
             # If status is changed from completed to something else, clear completed_at
             validated_data['completed_at'] = None
         
-        return super().update(instance, validated_data)
+        # Re-run AI enrichment only when the title or description actually changed
+        needs_enrichment = False
+        if 'title' in validated_data or 'description' in validated_data:
+            title = validated_data.get('title', instance.title)
+            description = validated_data.get('description', instance.description)
+            if instance.ai_dirty or Task.compute_ai_input_hash(title, description) != instance.ai_input_hash:
+                apply_quick_analysis(validated_data, title, description)
+                needs_enrichment = True
+        
+        task = super().update(instance, validated_data)
+        if needs_enrichment:
+            schedule_ai_enrichment(task)
+        return task
 
 
-class TaskListSerializer(serializers.ModelSerializer):
+class TaskListSerializer(TaskDisplayMixin, serializers.ModelSerializer):
     """Simplified serializer for listing tasks"""
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
-    priority_display = serializers.CharField(source='get_priority_display', read_only=True)
     user = serializers.CharField(source='user.username', read_only=True)
     
     class Meta:
@@ -110,7 +158,9 @@ class TaskCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating new tasks with AI integration"""
     class Meta:
         model = Task
-        fields = ['title', 'description', 'priority', 'due_date', 'category']
+        fields = ['id', 'title', 'description', 'priority', 'due_date', 'category', 'pending_ai_enrichment']
+        # id and pending_ai_enrichment let clients poll for the background AI results
+        read_only_fields = ['id', 'pending_ai_enrichment']
     
     def validate_title(self, value):
         """Validate that title is not empty"""
@@ -126,38 +176,12 @@ class TaskCreateSerializer(serializers.ModelSerializer):
         else:
             raise serializers.ValidationError("User is required.")
         
-        # Get recent context entries for AI processing
-        recent_context = ContextEntry.objects.filter(
-            user=request.user,
-            created_at__gte=timezone.now() - timedelta(days=7)
-        ).values('content', 'source_type')[:10]
-        
-        # AI-powered enhancements
-        title = validated_data.get('title', '')
-        description = validated_data.get('description', '')
-        
-        # Calculate priority score
-        priority_score = ai_manager.prioritize_task(title, description, list(recent_context))
-        validated_data['priority_score'] = priority_score
+        # Local suggestions now, AI-powered enhancements in the background
+        apply_quick_analysis(
+            validated_data,
+            validated_data.get('title', ''), validated_data.get('description', '')
+        )
         
-        # Suggest deadline
-        current_workload = Task.objects.filter(user=request.user, status='pending').count()
-        suggested_deadline = ai_manager.suggest_deadline(title, description, current_workload)
-        if suggested_deadline:
-            validated_data['suggested_deadline'] = suggested_deadline
-        
-        # Suggest category and tags
-        category_name, tags = ai_manager.suggest_categories_and_tags(title, description)
-        if category_name:
-            category, created = Category.objects.get_or_create(
-                name=category_name,
-                defaults={'color': '#3B82F6'}
-            )
-            validated_data['category'] = category
-            validated_data['tags'] = tags
-        
-        # Enhance description
-        enhanced_description = ai_manager.enhance_task_description(title, description, list(recent_context))
-        validated_data['ai_enhanced_description'] = enhanced_description
-        
-        return super().create(validated_data)
+        task = super().create(validated_data)
+        schedule_ai_enrichment(task)
+        return task
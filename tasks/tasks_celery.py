@@ -0,0 +1,55 @@
+"""
+Background jobs for the tasks app
+AI processing runs here so saving tasks and context entries doesn't wait on OpenAI
+"""
+
+from celery import shared_task
+from django.utils import timezone
+from .models import Task, ContextEntry
+from .ai_module import ai_manager
+from .utils import (
+    recent_context_for_user, pending_workload_for_user,
+    task_analysis_fields, context_analysis_fields
+)
+
+
+@shared_task
+def enrich_task(task_id):
+    """Run AI analysis for a task and store the results"""
+    try:
+        task = Task.objects.get(id=task_id)
+    except Task.DoesNotExist:
+        return
+
+    analysis = ai_manager.analyze_new_task(
+        task.title,
+        task.description,
+        recent_context_for_user(task.user),
+        pending_workload_for_user(task.user, exclude_task_id=task.id)
+    )
+
+    fields = task_analysis_fields(analysis, task.title, task.description)
+    # Only write if the title and description are still the ones analyzed; an
+    # edit made meanwhile has queued its own enrichment and must not be overwritten
+    Task.objects.filter(id=task.id, ai_input_hash=fields['ai_input_hash']).update(
+        pending_ai_enrichment=False,
+        updated_at=timezone.now(),
+        **fields
+    )
+
+
+@shared_task
+def analyze_context_entry(context_entry_id):
+    """Run AI analysis for a context entry and store the insights"""
+    try:
+        context_entry = ContextEntry.objects.get(id=context_entry_id)
+    except ContextEntry.DoesNotExist:
+        return
+
+    analysis = ai_manager.analyze_context(context_entry.content, context_entry.source_type)
+
+    fields = context_analysis_fields(analysis)
+    for name, value in fields.items():
+        setattr(context_entry, name, value)
+    # Only write the analysis columns, not the (possibly large) content
+    context_entry.save(update_fields=list(fields) + ['updated_at'])
@@ -1,3 +1,545 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from unittest import mock, skipIf
 
-# Create your tests here.
+import httpx
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from . import ai_cache, ai_module
+from .ai_cache import SemanticCache
+from .ai_module import ai_manager
+from .models import ContextEntry, Task
+from .rate_limit import TokenBucket
+from .serializers import TaskListSerializer, TaskSerializer
+from .tasks_celery import analyze_context_entry, enrich_task
+from .utils import pending_workload_for_user, recent_context_for_user
+
+
+class TokenBucketTests(TestCase):
+    """Tests for the client-side AI rate limiter"""
+
+    def test_consumes_up_to_capacity(self):
+        with mock.patch('tasks.rate_limit.time.monotonic', return_value=100.0):
+            bucket = TokenBucket(rate=1, capacity=3)
+            self.assertEqual([bucket.try_consume() for _ in range(4)], [True, True, True, False])
+
+    def test_refills_over_time(self):
+        with mock.patch('tasks.rate_limit.time.monotonic') as monotonic:
+            monotonic.return_value = 100.0
+            bucket = TokenBucket(rate=2, capacity=1)
+            self.assertTrue(bucket.try_consume())
+            self.assertFalse(bucket.try_consume())
+
+            monotonic.return_value = 100.5
+            self.assertTrue(bucket.try_consume())
+
+    def test_refill_is_capped_at_capacity(self):
+        with mock.patch('tasks.rate_limit.time.monotonic') as monotonic:
+            monotonic.return_value = 100.0
+            bucket = TokenBucket(rate=10, capacity=2)
+
+            monotonic.return_value = 1000.0
+            self.assertEqual([bucket.try_consume() for _ in range(3)], [True, True, False])
+
+    def test_shared_bucket_limits_per_window(self):
+        cache.clear()
+        with mock.patch('tasks.rate_limit.time.time', return_value=1000.0):
+            bucket = TokenBucket(rate=1, capacity=2, shared=True, key='test_rate_limit')
+            self.assertEqual([bucket.try_consume() for _ in range(3)], [True, True, False])
+
+    def test_rate_limited_calls_are_not_retried(self):
+        retry = ai_manager.session.get_adapter(ai_manager.base_url).max_retries
+        self.assertFalse(retry.is_retry('POST', 429, has_retry_after=True))
+        self.assertTrue(retry.is_retry('POST', 503))
+
+
+def api_response(answer):
+    """A successful chat completion response carrying the given answer"""
+    return mock.Mock(status_code=200, content=json.dumps(
+        {'choices': [{'message': {'content': answer}}]}
+    ).encode('utf-8'))
+
+
+class AnalyzeNewTaskTests(TestCase):
+    """Tests for the combined new-task analysis"""
+
+    valid = {
+        'priority_score': 0.8,
+        'suggested_deadline': '2030-01-02 09:30',
+        'category': 'Work',
+        'tags': ['report', 'budget'],
+        'enhanced_description': 'Prepare the quarterly budget report',
+    }
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(ai_manager, 'api_key', 'test-key')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def analyze(self, answer):
+        with mock.patch.object(ai_manager.session, 'post', return_value=api_response(answer)) as post, \
+                mock.patch.object(ai_manager, '_analyze_new_task_per_field') as per_field:
+            analysis = ai_manager.analyze_new_task('Budget report', 'Quarterly numbers', [], 0)
+        self.assertFalse(per_field.called)
+        return analysis, post
+
+    def test_combined_answer_takes_one_call(self):
+        analysis, post = self.analyze(json.dumps(self.valid))
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(analysis.priority_score, 0.8)
+        self.assertEqual(analysis.suggested_deadline.year, 2030)
+        self.assertEqual(analysis.category, 'Work')
+        self.assertEqual(analysis.tags, ['report', 'budget'])
+        self.assertEqual(analysis.enhanced_description, 'Prepare the quarterly budget report')
+
+    def test_requests_json_mode(self):
+        _, post = self.analyze(json.dumps(self.valid))
+        body = json.loads(post.call_args.kwargs['data'])
+        self.assertEqual(body['response_format'], {'type': 'json_object'})
+
+    def test_code_fenced_answer_is_parsed(self):
+        analysis, post = self.analyze('```json\n' + json.dumps(self.valid) + '\n```')
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(analysis.category, 'Work')
+
+    def test_explicit_null_deadline(self):
+        analysis, _ = self.analyze(json.dumps(dict(self.valid, suggested_deadline=None)))
+        self.assertIsNone(analysis.suggested_deadline)
+
+
+class FromAITests(TestCase):
+    """Tests for flagging analyses that fell back to the local heuristics"""
+
+    def parse(self, result):
+        return ai_manager._parse_task_analysis(result, 'Budget report', 'Quarterly numbers', 0)
+
+    def test_valid_response_is_from_ai(self):
+        self.assertTrue(self.parse(AnalyzeNewTaskTests.valid).from_ai)
+
+    def test_empty_response_is_not_from_ai(self):
+        self.assertFalse(self.parse({}).from_ai)
+
+    def test_any_fallback_field_clears_from_ai(self):
+        for key, value in [
+            ('priority_score', 'high'),
+            ('priority_score', 1.5),
+            ('suggested_deadline', 'next week'),
+            ('tags', 'report'),
+            ('enhanced_description', ''),
+        ]:
+            with self.subTest(key=key, value=value):
+                self.assertFalse(self.parse(dict(AnalyzeNewTaskTests.valid, **{key: value})).from_ai)
+
+    def test_non_string_category_falls_back(self):
+        analysis = self.parse(dict(AnalyzeNewTaskTests.valid, category=5))
+        self.assertFalse(analysis.from_ai)
+        self.assertIsInstance(analysis.category, str)
+
+    def test_per_field_responses(self):
+        responses = ['0.4', 'None', '{"category": "Home", "tags": ["garden"]}', 'Water the plants']
+        self.assertTrue(ai_manager._parse_field_responses(responses, 'Garden', '', 0).from_ai)
+        self.assertFalse(ai_manager._parse_field_responses([None] * 4, 'Garden', '', 0).from_ai)
+
+
+class TaskUpdateEnrichmentTests(TestCase):
+    """Tests for re-running AI enrichment on task updates"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='secret')
+        self.task = Task.objects.create(
+            user=self.user,
+            title='Write report',
+            description='Quarterly numbers',
+            ai_input_hash=Task.compute_ai_input_hash('Write report', 'Quarterly numbers'),
+            ai_dirty=False,
+        )
+
+    def update(self, data):
+        serializer = TaskSerializer(self.task, data=data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with self.captureOnCommitCallbacks() as callbacks:
+            serializer.save()
+        self.task.refresh_from_db()
+        return callbacks
+
+    def test_unchanged_title_and_description_skip_enrichment(self):
+        callbacks = self.update({'title': 'Write report', 'description': 'Quarterly numbers'})
+        self.assertEqual(callbacks, [])
+        self.assertFalse(self.task.pending_ai_enrichment)
+
+    def test_changed_title_schedules_enrichment(self):
+        callbacks = self.update({'title': 'Write the annual report'})
+        self.assertEqual(len(callbacks), 1)
+        self.assertTrue(self.task.pending_ai_enrichment)
+        self.assertEqual(
+            self.task.ai_input_hash,
+            Task.compute_ai_input_hash('Write the annual report', 'Quarterly numbers')
+        )
+
+    def test_dirty_task_is_enriched_again(self):
+        Task.objects.filter(id=self.task.id).update(ai_dirty=True)
+        self.task.refresh_from_db()
+        callbacks = self.update({'title': 'Write report'})
+        self.assertEqual(len(callbacks), 1)
+
+
+class ResponseCacheTests(TestCase):
+    """Tests for caching AI answers"""
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(ai_manager, 'api_key', 'test-key')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def prioritize_twice(self, answer):
+        with mock.patch.object(ai_manager.session, 'post', return_value=api_response(answer)) as post:
+            for _ in range(2):
+                ai_manager.prioritize_task('Pay rent', 'Due on Friday')
+        return post.call_count
+
+    def test_valid_answer_is_served_from_cache(self):
+        self.assertEqual(self.prioritize_twice('0.7'), 1)
+
+    def test_invalid_answer_is_not_cached(self):
+        self.assertEqual(self.prioritize_twice('high'), 2)
+
+    def test_incomplete_combined_answer_is_not_cached(self):
+        answer = json.dumps(dict(AnalyzeNewTaskTests.valid, category=5))
+        with mock.patch.object(ai_manager.session, 'post', return_value=api_response(answer)) as post:
+            for _ in range(2):
+                ai_manager.analyze_new_task('Budget report', 'Quarterly numbers', [], 0)
+        self.assertEqual(post.call_count, 2)
+
+
+@skipIf(ai_cache.np is None, 'numpy is not installed')
+class SemanticCacheTests(TestCase):
+    """Tests for the semantic lookup of cached AI answers, with fixed embeddings"""
+
+    embeddings = {
+        'Pay rent': (1.0, 0.0),
+        'Pay the rent': (0.99, 0.141),
+        'Buy milk': (0.0, 1.0),
+    }
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(
+            ai_cache, '_embed', side_effect=lambda text: ai_cache.np.array(self.embeddings[text])
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = SemanticCache(threshold=0.9)
+        self.cache.semantic_enabled = True
+        self.cache.set('prioritize_task', 'prompt: Pay rent', 'Pay rent', '0.7', scope='home')
+
+    def test_paraphrase_is_served_from_cache(self):
+        self.assertEqual(self.cache.get('prioritize_task', 'prompt: Pay the rent', 'Pay the rent', 'home'), '0.7')
+
+    def test_dissimilar_text_misses(self):
+        self.assertIsNone(self.cache.get('prioritize_task', 'prompt: Buy milk', 'Buy milk', 'home'))
+
+    def test_other_scope_or_method_misses(self):
+        self.assertIsNone(self.cache.get('prioritize_task', 'prompt: Pay the rent', 'Pay the rent', 'work'))
+        self.assertIsNone(self.cache.get('enhance_task_description', 'prompt: Pay the rent', 'Pay the rent', 'home'))
+
+    def test_empty_text_only_matches_exact_prompt(self):
+        self.assertIsNone(self.cache.get('prioritize_task', 'prompt: Pay the rent', '', 'home'))
+        self.assertEqual(self.cache.get('prioritize_task', 'prompt: Pay rent', '', 'home'), '0.7')
+
+
+class TaskEnrichmentJobTests(TestCase):
+    """Tests for AI enrichment running in the background"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_task(self, title='Write report', description='Quarterly numbers'):
+        return Task.objects.create(
+            user=self.user,
+            title=title,
+            description=description,
+            ai_input_hash=Task.compute_ai_input_hash(title, description),
+            pending_ai_enrichment=True,
+        )
+
+    def test_create_response_can_be_polled(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post('/api/tasks/', {'title': 'Write report'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(callbacks), 1)
+        self.assertTrue(response.data['pending_ai_enrichment'])
+
+        response = self.client.get(f"/api/tasks/{response.data['id']}/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_enrichment_is_saved_when_input_unchanged(self):
+        task = self.create_task()
+        enrich_task(task.id)
+        task.refresh_from_db()
+        self.assertFalse(task.pending_ai_enrichment)
+
+    def test_stale_enrichment_does_not_overwrite_newer_edit(self):
+        task = self.create_task()
+        newer_hash = Task.compute_ai_input_hash('Renamed', 'Quarterly numbers')
+
+        def edit_during_analysis(*args, **kwargs):
+            Task.objects.filter(id=task.id).update(title='Renamed', ai_input_hash=newer_hash)
+            return ai_manager.quick_task_analysis('Write report', 'Quarterly numbers')
+
+        with mock.patch.object(ai_manager, 'analyze_new_task', side_effect=edit_during_analysis):
+            enrich_task(task.id)
+
+        task.refresh_from_db()
+        self.assertEqual(task.ai_input_hash, newer_hash)
+        self.assertTrue(task.pending_ai_enrichment)
+
+
+class EagerEnrichmentTests(TransactionTestCase):
+    """Tests for responses when enrichment runs inline, as in development"""
+
+    def test_update_response_reflects_inline_enrichment(self):
+        user = User.objects.create_user(username='alice', password='secret')
+        task = Task.objects.create(user=user, title='Write report')
+        client = APIClient()
+        client.force_authenticate(user)
+
+        conf = enrich_task.app.conf
+        self.addCleanup(setattr, conf, 'task_always_eager', conf.task_always_eager)
+        conf.task_always_eager = True
+        response = client.patch(f'/api/tasks/{task.id}/', {'title': 'Write annual report'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        task.refresh_from_db()
+        self.assertFalse(task.pending_ai_enrichment)
+        self.assertFalse(response.data['pending_ai_enrichment'])
+
+
+class AIInputLookupTests(TestCase):
+    """Tests for the context and workload passed to the AI"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='secret')
+
+    def test_recent_context_is_last_week_newest_first(self):
+        old = ContextEntry.objects.create(user=self.user, content='old note')
+        ContextEntry.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=8))
+        for i in range(12):
+            entry = ContextEntry.objects.create(user=self.user, content=f'note {i}')
+            ContextEntry.objects.filter(id=entry.id).update(created_at=timezone.now() - timedelta(hours=i))
+
+        context = recent_context_for_user(self.user)
+        self.assertEqual(len(context), 10)
+        self.assertEqual(context[0], {'content': 'note 0', 'source_type': 'notes'})
+        self.assertNotIn('old note', [entry['content'] for entry in context])
+
+    def test_pending_workload_can_exclude_a_task(self):
+        task = Task.objects.create(user=self.user, title='Write report')
+        Task.objects.create(user=self.user, title='Pay rent')
+        Task.objects.create(user=self.user, title='Done', status='completed')
+        self.assertEqual(pending_workload_for_user(self.user), 2)
+        self.assertEqual(pending_workload_for_user(self.user, exclude_task_id=task.id), 1)
+
+
+class AISuggestionsTests(TestCase):
+    """Tests for the async AI suggestions endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='alice', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            return httpx.Response(200, json={
+                'choices': [{'message': {'content': json.dumps(AnalyzeNewTaskTests.valid)}}]
+            })
+
+        for patcher in (
+            mock.patch.object(ai_manager, 'api_key', 'test-key'),
+            mock.patch.object(ai_manager, '_shared_async_client',
+                              lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_suggestions_come_from_one_async_call(self):
+        response = self.client.post(
+            '/api/context/ai_suggestions/', {'title': 'Budget report'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(response.data['category'], 'Work')
+        self.assertEqual(response.data['priority_score'], 0.8)
+        self.assertEqual(response.data['suggested_deadline'], '2030-01-02T09:30:00')
+
+    def test_title_is_required(self):
+        response = self.client.post('/api/context/ai_suggestions/', {}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.requests, [])
+
+    def test_context_entries_crud_still_works(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post('/api/context/', {'content': 'Meeting at 3pm'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(callbacks), 1)
+
+        response = self.client.get('/api/context/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+
+
+class TaskStatsTests(TestCase):
+    """Tests for the task statistics endpoint"""
+
+    def test_counts_come_from_one_query(self):
+        user = User.objects.create_user(username='alice', password='secret')
+        other = User.objects.create_user(username='bob', password='secret')
+        yesterday = timezone.now() - timedelta(days=1)
+        Task.objects.create(user=user, title='Overdue', due_date=yesterday, priority_score=0.9)
+        Task.objects.create(user=user, title='Started', status='in_progress', priority_score=0.7)
+        Task.objects.create(user=user, title='Late but done', status='completed', due_date=yesterday)
+        Task.objects.create(user=user, title='Done', status='completed')
+        Task.objects.create(user=other, title='Not mine', priority_score=0.9)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with self.assertNumQueries(1):
+            response = client.get('/api/tasks/stats/')
+
+        self.assertEqual(response.data, {
+            'total': 4,
+            'completed': 2,
+            'pending': 1,
+            'in_progress': 1,
+            'high_priority': 2,
+            'overdue': 1,
+            'completion_rate': 50.0,
+        })
+
+
+class MyTasksTests(TestCase):
+    """Tests for the values()-based my_tasks endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Task.objects.create(user=self.user, title='Pay rent', priority='high',
+                            due_date=timezone.now() + timedelta(days=2))
+        Task.objects.create(user=self.user, title='Write report', status='in_progress')
+        Task.objects.create(user=self.user, title='Done', status='completed', priority='low')
+
+    def test_output_matches_task_list_serializer(self):
+        response = self.client.get('/api/tasks/my_tasks/')
+        expected = TaskListSerializer(Task.objects.filter(user=self.user), many=True).data
+        self.assertEqual(response.json(), json.loads(JSONRenderer().render(expected)))
+
+    def test_filters(self):
+        response = self.client.get('/api/tasks/my_tasks/', {'status': 'in_progress'})
+        self.assertEqual([task['title'] for task in response.json()], ['Write report'])
+
+        response = self.client.get('/api/tasks/my_tasks/', {'search': 'rent'})
+        self.assertEqual([task['title'] for task in response.json()], ['Pay rent'])
+
+
+class FallbackKeywordTests(TestCase):
+    """Tests for the local context keyword extraction"""
+
+    def test_keywords_are_ranked_by_frequency(self):
+        analysis = ai_manager._fallback_context_analysis(
+            'Report on budget. Budget meeting with the team; the budget report is due.'
+        )
+        self.assertEqual(analysis['keywords'][:3], ['budget', 'report', 'meeting'])
+
+    def test_stopwords_and_short_words_are_skipped(self):
+        analysis = ai_manager._fallback_context_analysis('This will have been with them: call Bob')
+        self.assertEqual(analysis['keywords'], ['them', 'call'])
+
+
+class FallbackCategorizationTests(TestCase):
+    """Tests for the local category keyword matching"""
+
+    cases = [
+        ('Finish homework', 'Work'),
+        ('Clean the house', 'Home'),
+        ('Book a doctor appointment', 'Health'),
+        ('Read a book on Django', 'Learning'),
+        ('Buy a birthday gift', 'Personal'),
+    ]
+
+    def categorize_all(self):
+        ai_module._fallback_categorization_impl.cache_clear()
+        self.addCleanup(ai_module._fallback_categorization_impl.cache_clear)
+        return [ai_manager._fallback_categorization(title)[0] for title, _ in self.cases]
+
+    @skipIf(ai_module._CATEGORY_AUTOMATON is None, 'pyahocorasick is not installed')
+    def test_automaton_follows_category_precedence(self):
+        self.assertEqual(self.categorize_all(), [category for _, category in self.cases])
+
+    def test_keyword_scan_follows_category_precedence(self):
+        with mock.patch.object(ai_module, '_CATEGORY_AUTOMATON', None):
+            self.assertEqual(self.categorize_all(), [category for _, category in self.cases])
+
+
+class ContextBoundTests(TestCase):
+    """Tests for bounding the context sent with AI prompts"""
+
+    entries = [{'content': f'entry {i} ' + 'x' * 600} for i in range(10)]
+
+    def test_summary_is_capped_and_most_recent_first(self):
+        summary = ai_manager._summarize_context(self.entries)
+        self.assertLessEqual(len(summary), 1500)
+        self.assertTrue(summary.startswith('entry 0 '))
+        self.assertNotIn('entry 3', summary)
+
+    def test_short_context_is_kept_whole(self):
+        entries = [{'content': 'Dentist on Friday'}, {'content': 'Rent due'}]
+        self.assertEqual(ai_manager._summarize_context(entries), 'Dentist on Friday Rent due')
+
+    def test_prompt_size_does_not_grow_with_context(self):
+        small, _ = ai_manager._task_analysis_request('Pay rent', '', self.entries[:3], 0)
+        large, _ = ai_manager._task_analysis_request('Pay rent', '', self.entries * 20, 0)
+        self.assertEqual(len(small), len(large))
+
+
+class ContextEntryAnalysisTests(TestCase):
+    """Tests for analyzing context entries in the background"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='secret')
+        self.entry = ContextEntry.objects.create(user=self.user, content='Urgent: budget report due Friday')
+
+    def test_analysis_is_saved(self):
+        analyze_context_entry(self.entry.id)
+        self.entry.refresh_from_db()
+        self.assertIn('budget', self.entry.keywords)
+        self.assertEqual(self.entry.priority_score, 0.8)
+
+    def test_only_analysis_columns_are_written(self):
+        def edit_during_analysis(*args, **kwargs):
+            ContextEntry.objects.filter(id=self.entry.id).update(content='Edited meanwhile')
+            return ai_manager._fallback_context_analysis('Urgent: budget report due Friday')
+
+        with mock.patch.object(ai_manager, 'analyze_context', side_effect=edit_during_analysis), \
+                CaptureQueriesContext(connection) as queries:
+            analyze_context_entry(self.entry.id)
+
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.content, 'Edited meanwhile')
+        self.assertIn('budget', self.entry.keywords)
+        update = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')][-1]
+        self.assertNotIn('"content"', update)
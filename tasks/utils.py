@@ -0,0 +1,72 @@
+from datetime import timedelta
+from typing import Dict, List
+from django.db.models import Count
+from django.utils import timezone
+from .models import Task, Category, ContextEntry
+
+
+def recent_context_for_user(user) -> List[Dict]:
+    """Return the user's context entries from the last 7 days for AI processing"""
+    return list(
+        ContextEntry.objects.filter(
+            user=user,
+            created_at__gte=timezone.now() - timedelta(days=7)
+        ).order_by('-created_at').values('content', 'source_type')[:10]
+    )
+
+
+def pending_workload_for_user(user, exclude_task_id=None) -> int:
+    """Return the user's number of pending tasks"""
+    queryset = Task.objects.filter(user=user, status='pending')
+    if exclude_task_id is not None:
+        queryset = queryset.exclude(id=exclude_task_id)
+    return queryset.aggregate(c=Count('id'))['c']
+
+
+def task_analysis_fields(analysis, title, description) -> Dict:
+    """Map a TaskAnalysis onto Task field values"""
+    fields = {
+        'priority_score': analysis.priority_score,
+        'ai_enhanced_description': analysis.enhanced_description,
+        # Only a real AI answer clears the dirty flag; fallbacks get retried later
+        'ai_input_hash': Task.compute_ai_input_hash(title, description),
+        'ai_dirty': not analysis.from_ai,
+    }
+
+    if analysis.suggested_deadline:
+        fields['suggested_deadline'] = analysis.suggested_deadline
+
+    if analysis.category:
+        category, created = Category.objects.get_or_create(
+            name=analysis.category,
+            defaults={'color': '#3B82F6'}
+        )
+        fields['category'] = category
+        fields['tags'] = analysis.tags
+
+    return fields
+
+
+def context_analysis_fields(analysis: Dict) -> Dict:
+    """Map a context analysis onto ContextEntry field values"""
+    sentiment_map = {
+        'positive': 0.8,
+        'negative': 0.2,
+        'neutral': 0.5
+    }
+    sentiment = analysis.get('sentiment', 'neutral')
+
+    priorities = analysis.get('priorities', [])
+    if 'high' in priorities or 'urgent' in priorities:
+        priority_score = 0.8
+    elif 'important' in priorities:
+        priority_score = 0.6
+    else:
+        priority_score = 0.4
+
+    return {
+        'processed_insights': analysis,
+        'keywords': analysis.get('keywords', []),
+        'sentiment_score': sentiment_map.get(str(sentiment).lower(), 0.5),
+        'priority_score': priority_score,
+    }
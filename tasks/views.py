@@ -1,15 +1,20 @@
-from rest_framework import viewsets, permissions, status
+from adrf.viewsets import GenericViewSet as AsyncGenericViewSet
+from asgiref.sync import sync_to_async
+from rest_framework import mixins, viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, Q
 from django.utils import timezone
-from datetime import timedelta
 from .models import Task, Category, ContextEntry
 from .serializers import (
     TaskSerializer, TaskListSerializer, TaskCreateSerializer,
-    CategorySerializer, ContextEntrySerializer
+    CategorySerializer, ContextEntrySerializer, STATUS_DISPLAY, PRIORITY_DISPLAY
 )
 from .ai_module import ai_manager
+from .tasks_celery import analyze_context_entry
+from .utils import recent_context_for_user, pending_workload_for_user
 
 
 class TaskViewSet(viewsets.ModelViewSet):
@@ -20,7 +25,8 @@ class TaskViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Return tasks for the current user"""
-        return Task.objects.filter(user=self.request.user)
+        # Join the user and category so serializers don't query them per row
+        return Task.objects.filter(user=self.request.user).select_related('user', 'category')
     
     def get_serializer_class(self):
         """Return appropriate serializer class based on action"""
@@ -66,33 +72,43 @@ class TaskViewSet(viewsets.ModelViewSet):
         if search:
             queryset = queryset.filter(title__icontains=search)
         
-        serializer = TaskListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        # Plain values() rows instead of model instances, same shape as TaskListSerializer
+        tasks = list(queryset.values(
+            'id', 'title', 'status', 'priority', 'due_date', 'created_at', 'user__username'
+        ))
+        for task in tasks:
+            task['status_display'] = STATUS_DISPLAY.get(task['status'], task['status'])
+            task['priority_display'] = PRIORITY_DISPLAY.get(task['priority'], task['priority'])
+            task['user'] = task.pop('user__username')
+        return Response(tasks)
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Get task statistics for the current user"""
         queryset = self.get_queryset()
         
-        total_tasks = queryset.count()
-        completed_tasks = queryset.filter(status='completed').count()
-        pending_tasks = queryset.filter(status='pending').count()
-        in_progress_tasks = queryset.filter(status='in_progress').count()
-        
-        # AI-powered insights
-        high_priority_tasks = queryset.filter(priority_score__gte=0.7).count()
-        overdue_tasks = queryset.filter(
-            due_date__lt=timezone.now(),
-            status__in=['pending', 'in_progress']
-        ).count()
+        # All counts in a single query, including the AI-powered insights
+        counts = queryset.aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            pending=Count('id', filter=Q(status='pending')),
+            in_progress=Count('id', filter=Q(status='in_progress')),
+            high_priority=Count('id', filter=Q(priority_score__gte=0.7)),
+            overdue=Count('id', filter=Q(
+                due_date__lt=timezone.now(),
+                status__in=['pending', 'in_progress']
+            ))
+        )
+        total_tasks = counts['total']
+        completed_tasks = counts['completed']
         
         stats = {
             'total': total_tasks,
             'completed': completed_tasks,
-            'pending': pending_tasks,
-            'in_progress': in_progress_tasks,
-            'high_priority': high_priority_tasks,
-            'overdue': overdue_tasks,
+            'pending': counts['pending'],
+            'in_progress': counts['in_progress'],
+            'high_priority': counts['high_priority'],
+            'overdue': counts['overdue'],
             'completion_rate': round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 1)
         }
         
@@ -112,8 +128,17 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return user_categories
 
 
-class ContextEntryViewSet(viewsets.ModelViewSet):
-    """ViewSet for ContextEntry model with AI processing"""
+class ContextEntryViewSet(mixins.CreateModelMixin,
+                          mixins.RetrieveModelMixin,
+                          mixins.UpdateModelMixin,
+                          mixins.DestroyModelMixin,
+                          mixins.ListModelMixin,
+                          AsyncGenericViewSet):
+    """
+    ViewSet for ContextEntry model with AI processing
+    CRUD actions stay synchronous; ai_suggestions is async so it doesn't hold a
+    worker thread while waiting on OpenAI
+    """
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ContextEntrySerializer
     
@@ -122,43 +147,12 @@ class ContextEntryViewSet(viewsets.ModelViewSet):
         return ContextEntry.objects.filter(user=self.request.user)
     
     def perform_create(self, serializer):
-        """Process context entry with AI analysis"""
+        """Save the context entry and queue its AI analysis"""
         context_entry = serializer.save(user=self.request.user)
-        
-        # AI processing
-        analysis = ai_manager.analyze_context(
-            context_entry.content, 
-            context_entry.source_type
-        )
-        
-        # Update with AI insights
-        context_entry.processed_insights = analysis
-        context_entry.keywords = analysis.get('keywords', [])
-        context_entry.sentiment_score = self._calculate_sentiment_score(analysis.get('sentiment', 'neutral'))
-        context_entry.priority_score = self._calculate_priority_score(analysis)
-        context_entry.save()
-    
-    def _calculate_sentiment_score(self, sentiment: str) -> float:
-        """Convert sentiment to numeric score"""
-        sentiment_map = {
-            'positive': 0.8,
-            'negative': 0.2,
-            'neutral': 0.5
-        }
-        return sentiment_map.get(sentiment.lower(), 0.5)
-    
-    def _calculate_priority_score(self, analysis: dict) -> float:
-        """Calculate priority score from analysis"""
-        priorities = analysis.get('priorities', [])
-        if 'high' in priorities or 'urgent' in priorities:
-            return 0.8
-        elif 'important' in priorities:
-            return 0.6
-        else:
-            return 0.4
+        transaction.on_commit(lambda: analyze_context_entry.delay(context_entry.id))
     
     @action(detail=False, methods=['post'])
-    def ai_suggestions(self, request):
+    async def ai_suggestions(self, request):
         """Get AI-powered suggestions for task creation"""
         title = request.data.get('title', '')
         description = request.data.get('description', '')
@@ -166,34 +160,20 @@ class ContextEntryViewSet(viewsets.ModelViewSet):
         if not title:
             return Response({'error': 'Title is required'}, status=400)
         
-        # Get recent context for AI processing
-        recent_context = ContextEntry.objects.filter(
-            user=request.user,
-            created_at__gte=timezone.now() - timedelta(days=7)
-        ).values('content', 'source_type')[:10]
+        # Generate AI suggestions in a single AI call
+        recent_context = await sync_to_async(recent_context_for_user)(request.user)
+        current_workload = await sync_to_async(pending_workload_for_user)(request.user)
+        analysis = await ai_manager.a_analyze_new_task(title, description, recent_context, current_workload)
         
-        # Generate AI suggestions
         suggestions = {
-            'priority_score': ai_manager.prioritize_task(title, description, list(recent_context)),
+            'priority_score': analysis.priority_score,
             'suggested_deadline': None,
-            'category': 'General',
-            'tags': [],
-            'enhanced_description': ''
+            'category': analysis.category,
+            'tags': analysis.tags,
+            'enhanced_description': analysis.enhanced_description
         }
         
-        # Suggest deadline
-        current_workload = Task.objects.filter(user=request.user, status='pending').count()
-        suggested_deadline = ai_manager.suggest_deadline(title, description, current_workload)
-        if suggested_deadline:
-            suggestions['suggested_deadline'] = suggested_deadline.isoformat()
-        
-        # Suggest category and tags
-        category_name, tags = ai_manager.suggest_categories_and_tags(title, description)
-        suggestions['category'] = category_name
-        suggestions['tags'] = tags
-        
-        # Enhance description
-        enhanced_description = ai_manager.enhance_task_description(title, description, list(recent_context))
-        suggestions['enhanced_description'] = enhanced_description
+        if analysis.suggested_deadline:
+            suggestions['suggested_deadline'] = analysis.suggested_deadline.isoformat()
         
         return Response(suggestions)